@@ -1,14 +1,28 @@
 # src/camera_handler.py
 import cv2
-from picamera2 import Picamera2
+import time
+import numpy as np
 from config import Config
 import logging
 
+try:
+    from picamera2 import Picamera2
+except ImportError:
+    Picamera2 = None
+
 class CameraHandler:
-    def __init__(self, use_pi_camera=True):
+    def __init__(self, use_pi_camera=True, dual_stream=None, fake_camera=False):
         self.config = Config()
-        self.use_pi_camera = use_pi_camera
+        self.fake_camera = fake_camera
+        self.use_pi_camera = use_pi_camera or fake_camera
+        self.dual_stream = self.config.DUAL_STREAM if dual_stream is None else dual_stream
         self.camera = None
+        self.request = None
+        self.main_shape = None
+        self.lores_shape = None
+        self.idle = False
+        self.idle_profile_enabled = True
+        self.last_face_time = time.monotonic()
         self.setup_logging()
         self.initialize_camera()
     
@@ -24,15 +38,30 @@ class CameraHandler:
         """Initialize camera based on type"""
         try:
             if self.use_pi_camera:
-                self.camera = Picamera2()
-                config = self.camera.create_preview_configuration(
-                    main={"format": 'XRGB8888', 
-                          "size": (self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT)}
-                )
-                self.camera.configure(config)
+                if self.fake_camera:
+                    from fake_picamera2 import FakePicamera2
+                    self.camera = FakePicamera2(self.config.FAKE_CAMERA_IMAGE)
+                    backend = "Fake camera"
+                elif Picamera2 is None:
+                    raise ImportError("picamera2 is not installed")
+                else:
+                    self.camera = Picamera2()
+                    backend = "Pi Camera"
+                
+                if self.dual_stream:
+                    self.configure_dual_stream(idle=False)
+                else:
+                    config = self.camera.create_preview_configuration(
+                        main={"format": 'XRGB8888', 
+                              "size": (self.config.CAMERA_WIDTH, self.config.CAMERA_HEIGHT)}
+                    )
+                    self.camera.configure(config)
                 self.camera.start()
-                self.logger.info("Pi Camera initialized successfully")
+                self.logger.info(f"{backend} initialized successfully")
             else:
+                if self.dual_stream:
+                    self.logger.warning("Dual-stream capture needs a Pi Camera, using single stream")
+                    self.dual_stream = False
                 self.camera = cv2.VideoCapture(0)
                 self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.CAMERA_WIDTH)
                 self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.CAMERA_HEIGHT)
@@ -54,10 +83,115 @@ class CameraHandler:
             self.logger.error(f"Failed to read frame: {e}")
             return False, None
     
+    def create_dual_stream_config(self, idle=False):
+        """Create a main + lores configuration for the active or idle profile"""
+        if idle:
+            # Fixed frame duration throttles the frame rate
+            main_size = (self.config.IDLE_MAIN_WIDTH, self.config.IDLE_MAIN_HEIGHT)
+            min_duration = max_duration = int(1000000 / self.config.IDLE_FPS)
+        else:
+            # Leave auto-exposure room for longer frames in low light
+            main_size = (self.config.MAIN_STREAM_WIDTH, self.config.MAIN_STREAM_HEIGHT)
+            min_duration = int(1000000 / self.config.CAMERA_FPS)
+            max_duration = int(1000000 / self.config.LOW_LIGHT_MIN_FPS)
+        
+        return self.camera.create_video_configuration(
+            main={"format": 'XRGB8888', "size": main_size},
+            lores={"format": 'YUV420', 
+                   "size": (self.config.LORES_STREAM_WIDTH, self.config.LORES_STREAM_HEIGHT)},
+            controls={"FrameDurationLimits": (min_duration, max_duration)}
+        )
+    
+    def configure_dual_stream(self, idle=False):
+        """Configure the camera with a dual-stream profile and record its stream shapes
+        
+        Sizes are read back after configure, as libcamera may adjust them.
+        """
+        config = self.create_dual_stream_config(idle=idle)
+        self.camera.configure(config)
+        width, height = config["main"]["size"]
+        self.main_shape = (height, width)
+        width, height = config["lores"]["size"]
+        self.lores_shape = (height, width)
+    
+    def read_lores(self):
+        """Capture a request and return the luma plane of its lores frame (dual-stream only)
+        
+        The lores luma plane is a grayscale image the ISP has already scaled
+        for detection. The request is held so read_main can sample the main
+        frame from the same capture.
+        """
+        try:
+            self.release_request()
+            self.request = self.camera.capture_request()
+            lores_frame = self.request.make_array("lores")
+            # YUV420 rows may be padded to the stride; the Y plane comes first
+            lores_height, lores_width = self.lores_shape
+            lores_gray = np.ascontiguousarray(lores_frame[:lores_height, :lores_width])
+            return True, lores_gray
+        except Exception as e:
+            self.logger.error(f"Failed to read lores frame: {e}")
+            self.release_request()
+            return False, None
+    
+    def read_main(self):
+        """Return the raw main frame of the request held by read_lores
+        
+        The frame keeps the four-channel layout read_frame converts from.
+        """
+        return self.request.make_array("main")
+    
+    def release_request(self):
+        """Hand the held request's buffers back to the camera"""
+        if self.request is not None:
+            self.request.release()
+            self.request = None
+    
+    def update_activity(self, faces_found):
+        """Switch to the idle profile after IDLE_TIMEOUT seconds without faces"""
+        if not (self.use_pi_camera and self.dual_stream and self.idle_profile_enabled):
+            return
+        
+        now = time.monotonic()
+        if faces_found:
+            self.last_face_time = now
+            if self.idle:
+                self.set_idle(False)
+        elif not self.idle and now - self.last_face_time >= self.config.IDLE_TIMEOUT:
+            self.set_idle(True)
+    
+    def set_idle(self, idle):
+        """Reconfigure the camera with the idle or active profile
+        
+        If the switch fails the previous profile is restored and profile
+        switching is disabled, so a bad profile does not restart the camera
+        on every frame. If restoring fails too the error is raised rather
+        than leaving the camera stopped.
+        """
+        self.release_request()
+        try:
+            self.camera.stop()
+            self.configure_dual_stream(idle=idle)
+            self.camera.start()
+            self.idle = idle
+            self.logger.info(f"Switched to {'idle' if idle else 'active'} capture profile")
+        except Exception as e:
+            self.logger.error(f"Failed to switch capture profile: {e}")
+            try:
+                self.camera.stop()
+                self.configure_dual_stream(idle=self.idle)
+                self.camera.start()
+                self.idle_profile_enabled = False
+                self.logger.warning("Restored previous capture profile, idle profile disabled")
+            except Exception as restore_error:
+                self.logger.error(f"Failed to restore capture profile: {restore_error}")
+                raise
+    
     def release(self):
         """Release camera resources"""
         try:
             if self.use_pi_camera:
+                self.release_request()
                 self.camera.stop()
             else:
                 self.camera.release()
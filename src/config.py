@@ -18,6 +18,27 @@ class Config:
     CAMERA_HEIGHT = 480
     CAMERA_FPS = 30
     
+    # Dual-stream capture settings (Pi Camera only)
+    # The ISP scales the lores stream for detection; the main stream is only
+    # sampled around detected faces for encoding.
+    DUAL_STREAM = False
+    MAIN_STREAM_WIDTH = 1280
+    MAIN_STREAM_HEIGHT = 960
+    # Same detection cost as single-stream; rounded down to even sizes for YUV420
+    LORES_STREAM_WIDTH = int(CAMERA_WIDTH * SCALE_FACTOR) & ~1
+    LORES_STREAM_HEIGHT = int(CAMERA_HEIGHT * SCALE_FACTOR) & ~1
+    LOW_LIGHT_MIN_FPS = 10  # Auto-exposure may slow frames down to this rate in low light
+    ENCODING_CROP_MARGIN = 0.5  # Padding around a face crop, as a fraction of the box size
+    
+    # Idle profile (dual-stream only)
+    IDLE_TIMEOUT = 10  # Seconds without faces before switching to the idle profile
+    IDLE_FPS = 5
+    IDLE_MAIN_WIDTH = 640
+    IDLE_MAIN_HEIGHT = 480
+    
+    # Fake camera (for running off-device)
+    FAKE_CAMERA_IMAGE = None  # Optional image to serve as every frame
+    
     # Display settings
     DISPLAY_WIDTH = 640
     DISPLAY_HEIGHT = 480
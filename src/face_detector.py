@@ -40,6 +40,58 @@ class FaceDetector:
         
         return face_locations
     
+    def detect_faces_lores(self, lores_frame, main_shape):
+        """Detect faces in a grayscale lores frame and return their locations
+        in main frame coordinates"""
+        if self.config.FACE_DETECTION_METHOD == 'cnn':
+            image = cv2.cvtColor(lores_frame, cv2.COLOR_GRAY2RGB)
+        else:
+            image = lores_frame
+        
+        face_locations = face_recognition.face_locations(
+            image, 
+            model=self.config.FACE_DETECTION_METHOD
+        )
+        
+        return self.map_face_locations(face_locations, lores_frame.shape[:2], main_shape[:2])
+    
+    def map_face_locations(self, face_locations, from_shape, to_shape):
+        """Map face locations between two streams covering the same field of view"""
+        from_height, from_width = from_shape
+        to_height, to_width = to_shape
+        scale_x = to_width / from_width
+        scale_y = to_height / from_height
+        
+        return [(max(0, int(top * scale_y)), 
+                 min(to_width, int(right * scale_x)),
+                 min(to_height, int(bottom * scale_y)), 
+                 max(0, int(left * scale_x))) 
+                for (top, right, bottom, left) in face_locations]
+    
+    def get_face_encodings_cropped(self, raw_frame, face_locations):
+        """Get face encodings from a raw four-channel main frame, converting
+        only a padded crop around each face"""
+        height, width = raw_frame.shape[:2]
+        margin = self.config.ENCODING_CROP_MARGIN
+        encodings = []
+        
+        for (top, right, bottom, left) in face_locations:
+            margin_y = int((bottom - top) * margin)
+            margin_x = int((right - left) * margin)
+            crop_top = max(0, top - margin_y)
+            crop_bottom = min(height, bottom + margin_y)
+            crop_left = max(0, left - margin_x)
+            crop_right = min(width, right + margin_x)
+            
+            # Raw frames share the channel order CameraHandler.read_frame converts from
+            rgb_crop = cv2.cvtColor(raw_frame[crop_top:crop_bottom, crop_left:crop_right], 
+                                    cv2.COLOR_RGBA2RGB)
+            crop_location = (top - crop_top, right - crop_left, 
+                             bottom - crop_top, left - crop_left)
+            encodings.extend(face_recognition.face_encodings(rgb_crop, [crop_location]))
+        
+        return encodings
+    
     def get_face_encodings(self, frame, face_locations):
         """Get face encodings for detected faces"""
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -44,7 +44,49 @@ class FaceRecognizer:
         
         # Get encodings for detected faces
         face_encodings = self.face_detector.get_face_encodings(frame, face_locations)
+        face_names = self.match_faces(face_encodings)
         
+        self.draw_faces(frame, face_locations, face_names)
+        return frame, face_names
+    
+    def recognize_faces_lores(self, lores_frame, main_shape, read_main_frame, 
+                              need_frame=False, need_frame_on_match=False):
+        """Recognize faces detected on a lores frame (dual-stream capture)
+        
+        read_main_frame returns the raw main frame and is only called when
+        faces are found or need_frame is set. The annotated BGR frame is built
+        when need_frame is set, or when need_frame_on_match is set and a known
+        face is recognized; otherwise None is returned in its place. The
+        frame is scaled to DISPLAY_WIDTH x DISPLAY_HEIGHT.
+        """
+        face_locations = self.face_detector.detect_faces_lores(lores_frame, main_shape)
+        
+        if not face_locations and not need_frame:
+            return None, []
+        
+        raw_frame = read_main_frame()
+        face_names = []
+        if face_locations:
+            face_encodings = self.face_detector.get_face_encodings_cropped(raw_frame, face_locations)
+            face_names = self.match_faces(face_encodings)
+        
+        matched = any(name != "Unknown" for name in face_names)
+        if not (need_frame or (need_frame_on_match and matched)):
+            return None, face_names
+        
+        # Downscale to the display size first so only display pixels are converted
+        display_frame = cv2.resize(raw_frame, 
+                                   (self.config.DISPLAY_WIDTH, self.config.DISPLAY_HEIGHT),
+                                   interpolation=cv2.INTER_AREA)
+        frame = cv2.cvtColor(display_frame, cv2.COLOR_RGBA2BGR)
+        display_locations = self.face_detector.map_face_locations(
+            face_locations, raw_frame.shape[:2], frame.shape[:2]
+        )
+        self.draw_faces(frame, display_locations, face_names)
+        return frame, face_names
+    
+    def match_faces(self, face_encodings):
+        """Match face encodings against the known faces"""
         face_names = []
         
         # Compare with known faces
@@ -69,7 +111,10 @@ class FaceRecognizer:
             
             face_names.append(name)
         
-        # Draw rectangles and labels
+        return face_names
+    
+    def draw_faces(self, frame, face_locations, face_names):
+        """Draw rectangles and labels for recognized faces"""
         for (top, right, bottom, left), name in zip(face_locations, face_names):
             # Draw rectangle
             color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)
@@ -79,5 +124,3 @@ class FaceRecognizer:
             cv2.rectangle(frame, (left, bottom - 35), (right, bottom), color, cv2.FILLED)
             cv2.putText(frame, name, (left + 6, bottom - 6), 
                        cv2.FONT_HERSHEY_DUPLEX, self.config.FONT_SCALE, (255, 255, 255), 1)
-        
-        return frame, face_names
\ No newline at end of file
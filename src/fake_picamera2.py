@@ -0,0 +1,148 @@
+# src/fake_picamera2.py
+import cv2
+import numpy as np
+
+class FakePicamera2:
+    """Stand-in for Picamera2 so camera code can run without a Pi Camera.
+
+    Frames come from a still image (or a synthetic pattern) and the lores
+    stream is produced the same shape the ISP would deliver: a YUV420
+    array of height * 3 / 2 rows, each padded to the stream's stride.
+    """
+
+    STRIDE_ALIGNMENT = 64
+
+    def __init__(self, image_path=None):
+        self.image_path = image_path
+        self.source = self.load_source(image_path)
+        self.camera_config = None
+        self.controls = {}
+        self.started = False
+        self.frame_count = 0
+
+    def load_source(self, image_path):
+        """Load the image every frame is rendered from"""
+        if image_path:
+            image = cv2.imread(image_path)
+            if image is None:
+                raise FileNotFoundError(f"Could not read fake camera image: {image_path}")
+            return image
+
+        # Gradient pattern so the frame is not completely flat
+        x = np.linspace(0, 255, 640, dtype=np.uint8)
+        y = np.linspace(0, 255, 480, dtype=np.uint8)
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        image[:, :, 0] = x[np.newaxis, :]
+        image[:, :, 1] = y[:, np.newaxis]
+        image[:, :, 2] = 128
+        return image
+
+    def create_configuration(self, main=None, lores=None, controls=None):
+        """Build a configuration dict in the layout Picamera2 uses"""
+        config = {
+            "main": dict({"format": 'XRGB8888', "size": (640, 480)}, **(main or {})),
+            "lores": None,
+            "controls": dict(controls or {})
+        }
+        if lores is not None:
+            config["lores"] = dict({"format": 'YUV420'}, **lores)
+        return config
+
+    def create_preview_configuration(self, main=None, lores=None, controls=None):
+        return self.create_configuration(main, lores, controls)
+
+    def create_video_configuration(self, main=None, lores=None, controls=None):
+        return self.create_configuration(main, lores, controls)
+
+    def configure(self, camera_config):
+        if self.started:
+            raise RuntimeError("Camera must be stopped before configuring")
+        lores = camera_config.get("lores")
+        if lores is not None:
+            main_width, main_height = camera_config["main"]["size"]
+            lores_width, lores_height = lores["size"]
+            if lores_width > main_width or lores_height > main_height:
+                raise ValueError("lores stream must not be larger than main stream")
+            if lores_width % 2 or lores_height % 2:
+                raise ValueError("YUV420 lores stream needs even dimensions")
+        self.camera_config = camera_config
+        self.controls = dict(camera_config.get("controls") or {})
+
+    def set_controls(self, controls):
+        self.controls.update(controls)
+
+    def start(self):
+        if self.camera_config is None:
+            raise RuntimeError("Camera must be configured before starting")
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def close(self):
+        self.stop()
+
+    def render_stream(self, name):
+        """Render the source image as the given stream would deliver it"""
+        stream = self.camera_config.get(name)
+        if stream is None:
+            raise RuntimeError(f"Stream '{name}' is not configured")
+        width, height = stream["size"]
+        image = cv2.resize(self.source, (width, height), interpolation=cv2.INTER_AREA)
+
+        if stream["format"] == 'YUV420':
+            return self.pad_yuv420(cv2.cvtColor(image, cv2.COLOR_BGR2YUV_I420), width, height)
+
+        # Channel order matches what CameraHandler converts from
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGBA)
+
+    def capture_array(self, name="main"):
+        if not self.started:
+            raise RuntimeError("Camera is not running")
+        self.frame_count += 1
+        return self.render_stream(name)
+
+    def pad_yuv420(self, yuv, width, height):
+        """Pad each Y, U and V row to the stride, as the ISP's buffers are"""
+        stride = -(-width // self.STRIDE_ALIGNMENT) * self.STRIDE_ALIGNMENT
+        flat = yuv.reshape(-1)
+        y_size = width * height
+        chroma_size = y_size // 4
+
+        y_plane = flat[:y_size].reshape(height, width)
+        u_plane = flat[y_size:y_size + chroma_size].reshape(height // 2, width // 2)
+        v_plane = flat[y_size + chroma_size:].reshape(height // 2, width // 2)
+
+        planes = [
+            np.pad(y_plane, ((0, 0), (0, stride - width))),
+            np.pad(u_plane, ((0, 0), (0, (stride - width) // 2))),
+            np.pad(v_plane, ((0, 0), (0, (stride - width) // 2)))
+        ]
+        return np.concatenate([plane.reshape(-1) for plane in planes]).reshape(-1, stride)
+
+    def capture_request(self):
+        if not self.started:
+            raise RuntimeError("Camera is not running")
+        self.frame_count += 1
+        return FakeCompletedRequest(self)
+
+
+class FakeCompletedRequest:
+    """Stand-in for a Picamera2 CompletedRequest holding one captured frame"""
+
+    def __init__(self, camera):
+        self.camera = camera
+        self.released = False
+        self.arrays_made = []
+
+    def make_array(self, name):
+        if self.released:
+            raise RuntimeError("Request has already been released")
+        self.arrays_made.append(name)
+        return self.camera.render_stream(name)
+
+    def get_metadata(self):
+        return {"FrameCount": self.camera.frame_count}
+
+    def release(self):
+        self.released = True
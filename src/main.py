@@ -26,7 +26,8 @@ def train_faces(images_path):
     
     logger.info("Training completed successfully!")
 
-def run_recognition(use_pi_camera=True, headless=False, save_images=False, enable_voice=True):
+def run_recognition(use_pi_camera=True, headless=False, save_images=False, enable_voice=True,
+                    dual_stream=None, fake_camera=False):
     """Run real-time face recognition"""
     logger = setup_logging()
     logger.info("Starting face recognition...")
@@ -38,7 +39,8 @@ def run_recognition(use_pi_camera=True, headless=False, save_images=False, enabl
     
     # Initialize components
     config = Config()
-    camera = CameraHandler(use_pi_camera=use_pi_camera)
+    camera = CameraHandler(use_pi_camera=use_pi_camera, dual_stream=dual_stream,
+                           fake_camera=fake_camera)
     recognizer = FaceRecognizer()
     
     # Initialize voice notifier
@@ -55,14 +57,29 @@ def run_recognition(use_pi_camera=True, headless=False, save_images=False, enabl
     
     try:
         while True:
-            # Read frame
-            ret, frame = camera.read_frame()
-            if not ret:
-                logger.error("Failed to read frame")
-                break
+            if camera.dual_stream:
+                # Detect on the lores frame; the main frame is only read when needed
+                ret, lores_frame = camera.read_lores()
+                if not ret:
+                    logger.error("Failed to read frame")
+                    break
+                
+                frame, names = recognizer.recognize_faces_lores(
+                    lores_frame, camera.main_shape, camera.read_main,
+                    need_frame=not headless, need_frame_on_match=save_images
+                )
+            else:
+                # Read frame
+                ret, frame = camera.read_frame()
+                if not ret:
+                    logger.error("Failed to read frame")
+                    break
+                
+                # Recognize faces
+                frame, names = recognizer.recognize_faces(frame)
             
-            # Recognize faces
-            frame, names = recognizer.recognize_faces(frame)
+            # Drop to the idle capture profile when nobody has been seen for a while
+            camera.update_activity(bool(names))
             
             # Voice notifications for recognized faces
             if voice_notifier and names:
@@ -129,8 +146,10 @@ def main():
                        help='Mode: train, recognize, or test-voice')
     parser.add_argument('--images-path', type=str, default='data/training_images',
                        help='Path to training images directory')
-    parser.add_argument('--camera', choices=['pi', 'usb'], default='pi',
-                       help='Camera type: pi or usb')
+    parser.add_argument('--camera', choices=['pi', 'usb', 'fake'], default='pi',
+                       help='Camera type: pi, usb, or fake (Picamera2 stand-in for testing)')
+    parser.add_argument('--dual-stream', action='store_true',
+                       help='Detect on the lores stream and encode from the main stream (Pi Camera only)')
     parser.add_argument('--headless', action='store_true',
                        help='Run without GUI display (for SSH/remote access)')
     parser.add_argument('--save-images', action='store_true',
@@ -144,8 +163,11 @@ def main():
         train_faces(args.images_path)
     elif args.mode == 'recognize':
         use_pi_camera = args.camera == 'pi'
+        fake_camera = args.camera == 'fake'
         enable_voice = not args.no_voice
-        run_recognition(use_pi_camera, args.headless, args.save_images, enable_voice)
+        dual_stream = True if args.dual_stream else None
+        run_recognition(use_pi_camera, args.headless, args.save_images, enable_voice,
+                        dual_stream, fake_camera)
     elif args.mode == 'test-voice':
         test_voice()
 
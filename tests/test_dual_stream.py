@@ -0,0 +1,245 @@
+# tests/test_dual_stream.py
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# Box mapping and crop math do not need dlib; tests mock the calls they make
+try:
+    import face_recognition  # noqa: F401
+except ImportError:
+    sys.modules['face_recognition'] = types.ModuleType('face_recognition')
+
+from camera_handler import CameraHandler
+from config import Config
+from face_detector import FaceDetector
+from face_recognizer import FaceRecognizer
+
+
+class TestDualStreamCamera(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.now = 0.0
+        patcher = mock.patch('camera_handler.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.camera = CameraHandler(fake_camera=True, dual_stream=True)
+        self.addCleanup(self.camera.release)
+
+    def test_stream_shapes(self):
+        ret, lores_frame = self.camera.read_lores()
+        self.assertTrue(ret)
+        self.assertEqual(lores_frame.shape,
+                         (self.config.LORES_STREAM_HEIGHT, self.config.LORES_STREAM_WIDTH))
+        self.assertTrue(lores_frame.flags['C_CONTIGUOUS'])
+
+        # The fake pads rows to the stride, so the slice above must trim them
+        raw_lores = self.camera.request.make_array("lores")
+        self.assertGreater(raw_lores.shape[1], self.config.LORES_STREAM_WIDTH)
+
+        main_frame = self.camera.read_main()
+        self.assertEqual(main_frame.shape,
+                         (self.config.MAIN_STREAM_HEIGHT, self.config.MAIN_STREAM_WIDTH, 4))
+        self.assertEqual(self.camera.main_shape, main_frame.shape[:2])
+
+    def test_lores_slice_uses_configured_size(self):
+        fake = self.camera.camera
+        original_configure = fake.configure
+
+        def adjusting_configure(camera_config):
+            # libcamera may realign stream sizes when validating
+            camera_config["lores"]["size"] = (176, 132)
+            original_configure(camera_config)
+
+        with mock.patch.object(fake, 'configure', side_effect=adjusting_configure):
+            self.camera.set_idle(True)
+
+        self.assertEqual(self.camera.lores_shape, (132, 176))
+        ret, lores_frame = self.camera.read_lores()
+        self.assertTrue(ret)
+        self.assertEqual(lores_frame.shape, (132, 176))
+
+    def test_main_frame_not_built_for_detection(self):
+        self.camera.read_lores()
+        request = self.camera.request
+        self.assertEqual(request.arrays_made, ["lores"])
+
+        self.camera.read_lores()
+        self.assertTrue(request.released)
+
+    def test_switches_to_idle_after_timeout(self):
+        self.now = self.config.IDLE_TIMEOUT - 1
+        self.camera.update_activity(False)
+        self.assertFalse(self.camera.idle)
+
+        self.now = self.config.IDLE_TIMEOUT
+        self.camera.update_activity(False)
+        self.assertTrue(self.camera.idle)
+        self.assertEqual(self.camera.main_shape,
+                         (self.config.IDLE_MAIN_HEIGHT, self.config.IDLE_MAIN_WIDTH))
+        idle_duration = int(1000000 / self.config.IDLE_FPS)
+        self.assertEqual(self.camera.camera.controls["FrameDurationLimits"],
+                         (idle_duration, idle_duration))
+
+        # Detection keeps working on the unchanged lores stream
+        ret, lores_frame = self.camera.read_lores()
+        self.assertTrue(ret)
+        self.assertEqual(lores_frame.shape,
+                         (self.config.LORES_STREAM_HEIGHT, self.config.LORES_STREAM_WIDTH))
+
+    def test_switches_back_on_face(self):
+        self.now = self.config.IDLE_TIMEOUT
+        self.camera.update_activity(False)
+        self.assertTrue(self.camera.idle)
+
+        self.now += 1
+        self.camera.update_activity(True)
+        self.assertFalse(self.camera.idle)
+        self.assertEqual(self.camera.main_shape,
+                         (self.config.MAIN_STREAM_HEIGHT, self.config.MAIN_STREAM_WIDTH))
+        min_duration, max_duration = self.camera.camera.controls["FrameDurationLimits"]
+        self.assertLess(min_duration, max_duration)
+
+        # A face resets the timeout
+        self.now += self.config.IDLE_TIMEOUT - 1
+        self.camera.update_activity(False)
+        self.assertFalse(self.camera.idle)
+
+    def test_failed_switch_restores_previous_profile(self):
+        fake = self.camera.camera
+        original_configure = fake.configure
+        calls = []
+
+        def failing_configure(camera_config):
+            calls.append(camera_config)
+            if len(calls) == 1:
+                raise RuntimeError("configure failed")
+            original_configure(camera_config)
+
+        with mock.patch.object(fake, 'configure', side_effect=failing_configure):
+            self.camera.set_idle(True)
+
+        self.assertFalse(self.camera.idle)
+        self.assertTrue(fake.started)
+        self.assertEqual(self.camera.main_shape,
+                         (self.config.MAIN_STREAM_HEIGHT, self.config.MAIN_STREAM_WIDTH))
+        self.assertTrue(self.camera.read_lores()[0])
+
+    def test_failed_switch_is_not_retried(self):
+        fake = self.camera.camera
+        original_configure = fake.configure
+
+        def failing_idle_configure(camera_config):
+            if camera_config["main"]["size"] == (self.config.IDLE_MAIN_WIDTH,
+                                                 self.config.IDLE_MAIN_HEIGHT):
+                raise RuntimeError("configure failed")
+            original_configure(camera_config)
+
+        with mock.patch.object(fake, 'configure',
+                               side_effect=failing_idle_configure) as configure:
+            self.now = self.config.IDLE_TIMEOUT
+            self.camera.update_activity(False)
+            self.assertEqual(configure.call_count, 2)
+
+            for _ in range(5):
+                self.now += self.config.IDLE_TIMEOUT
+                self.camera.update_activity(False)
+                self.camera.update_activity(True)
+
+        self.assertEqual(configure.call_count, 2)
+        self.assertFalse(self.camera.idle)
+        self.assertTrue(fake.started)
+
+
+class TestLoresFaceMapping(unittest.TestCase):
+    def setUp(self):
+        self.detector = FaceDetector()
+
+    def test_map_face_locations_scales_per_axis(self):
+        locations = self.detector.map_face_locations([(10, 40, 30, 20)], (120, 160), (960, 1280))
+        self.assertEqual(locations, [(80, 320, 240, 160)])
+
+        # Different aspect ratios scale each axis separately
+        locations = self.detector.map_face_locations([(10, 40, 30, 20)], (120, 160), (480, 1280))
+        self.assertEqual(locations, [(40, 320, 120, 160)])
+
+    def test_map_face_locations_clamps_to_frame(self):
+        locations = self.detector.map_face_locations([(-2, 170, 125, -3)], (120, 160), (960, 1280))
+        self.assertEqual(locations, [(0, 1280, 960, 0)])
+
+    def test_cropped_encodings_use_crop_relative_locations(self):
+        raw_frame = np.zeros((960, 1280, 4), dtype=np.uint8)
+        self.detector.config.ENCODING_CROP_MARGIN = 0.5
+        face_locations = [(100, 300, 300, 100), (900, 1270, 950, 1220)]
+
+        with mock.patch('face_detector.face_recognition.face_encodings', create=True,
+                        return_value=[np.zeros(128)]) as face_encodings:
+            encodings = self.detector.get_face_encodings_cropped(raw_frame, face_locations)
+
+        self.assertEqual(len(encodings), 2)
+
+        # 200px face with a 100px margin on every side
+        rgb_crop, crop_locations = face_encodings.call_args_list[0][0]
+        self.assertEqual(rgb_crop.shape, (400, 400, 3))
+        self.assertEqual(crop_locations, [(100, 300, 300, 100)])
+
+        # Margin is clipped at the frame edge
+        rgb_crop, crop_locations = face_encodings.call_args_list[1][0]
+        self.assertEqual(rgb_crop.shape, (85, 85, 3))
+        self.assertEqual(crop_locations, [(25, 75, 75, 25)])
+
+
+class TestRecognizeFacesLores(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.recognizer = FaceRecognizer()
+        self.lores_frame = np.zeros((120, 160), dtype=np.uint8)
+        self.main_shape = (960, 1280)
+        self.read_main_frame = mock.Mock(
+            return_value=np.zeros(self.main_shape + (4,), dtype=np.uint8)
+        )
+
+    def recognize(self, face_locations, face_names, **kwargs):
+        detector = self.recognizer.face_detector
+        with mock.patch.object(detector, 'detect_faces_lores', return_value=face_locations), \
+             mock.patch.object(detector, 'get_face_encodings_cropped',
+                               return_value=[np.zeros(128)] * len(face_names)), \
+             mock.patch.object(self.recognizer, 'match_faces', return_value=face_names):
+            return self.recognizer.recognize_faces_lores(
+                self.lores_frame, self.main_shape, self.read_main_frame, **kwargs
+            )
+
+    def test_main_frame_not_read_without_faces(self):
+        frame, names = self.recognize([], [], need_frame_on_match=True)
+        self.assertIsNone(frame)
+        self.assertEqual(names, [])
+        self.read_main_frame.assert_not_called()
+
+    def test_frame_built_on_match_only(self):
+        frame, names = self.recognize([(80, 320, 240, 160)], ["Unknown"],
+                                      need_frame_on_match=True)
+        self.assertIsNone(frame)
+        self.assertEqual(names, ["Unknown"])
+
+        frame, names = self.recognize([(80, 320, 240, 160)], ["alice"],
+                                      need_frame_on_match=True)
+        self.assertIsNotNone(frame)
+        self.assertEqual(names, ["alice"])
+
+    def test_display_frame_scaled_with_boxes(self):
+        with mock.patch.object(self.recognizer, 'draw_faces') as draw_faces:
+            frame, names = self.recognize([(80, 320, 240, 160)], ["alice"], need_frame=True)
+
+        self.assertEqual(frame.shape,
+                         (self.config.DISPLAY_HEIGHT, self.config.DISPLAY_WIDTH, 3))
+        _, display_locations, _ = draw_faces.call_args[0]
+        self.assertEqual(display_locations, [(40, 160, 120, 80)])
+
+
+if __name__ == '__main__':
+    unittest.main()